@@ -4,15 +4,15 @@ from utils.utils_data import *
 from utils.utils_models import *
 from utils.utils_vis import *
 from utils.utils_control import *
+from utils.utils_export import *
 from utils.utils_css import style
+from utils.utils_logging import log_timing
 import time
 
-def log_timing(description, start_time, end_time):
-    elapsed_time = end_time - start_time
-    print(f"{description} in {elapsed_time:.2f} seconds.")
-
 # Load data
 DATA_PATH = "masked_sales_df.csv"
+EXPORT_DIR = "exports"
+EXPORT_DB_PATH = f"{EXPORT_DIR}/forecast_store.db"
 start_time = time.time()
 sales_df = load_sales_data(DATA_PATH)
 log_timing("Data loaded", start_time, time.time())
@@ -69,26 +69,44 @@ if (train != 0).sum() < 13:
     st.stop()
 
 # Forecasting
-model_options = {
-    "Auto ARIMA": forecast_auto_arima,
-    "Seasonal ARIMA": forecast_sarima,
-    "Holt-Winters": forecast_holt_winters,
-    "Bayesian Regression": forecast_bayesian,
-    "Gradient Boosting": forecast_gradient_boost
-}
+model_options = MODEL_OPTIONS
+
+data_version = build_data_version(DATA_PATH, model_options.values())
+filter_key = build_filter_key(location_code, shipment_method, quantity_or_sales, data_version=data_version)
+use_store = store_control()
+stored_run = None
+if use_store:
+    start_time = time.time()
+    stored_run = load_forecast_run(EXPORT_DB_PATH, selected_sku, filter_key, split_date, list(model_options), test.index)
+    log_timing("Stored forecasts looked up", start_time, time.time())
+
+if stored_run is not None:
+    forecasts, rmse, mape, bias, mad = stored_run
+else:
+    start_time = time.time()
+    forecasts, rmse, mape, bias, mad = calculate_forecasts(train, test, model_options)
+    log_timing("Forecasts calculated", start_time, time.time())
 
-start_time = time.time()
-forecasts, rmse, mape, bias, mad = calculate_forecasts(train, test, model_options)
-log_timing("Forecasts calculated", start_time, time.time())
+# Identify best model based on MAPE
+best_model_name = min(mape, key=mape.get)
 
-# Format forecasts based on quantity or sales
+if use_store and stored_run is None:
+    start_time = time.time()
+    save_to_store(
+        EXPORT_DB_PATH,
+        forecast_records=build_forecast_records(selected_sku, filter_key, split_date, test, forecasts),
+        metric_records=build_metric_records(selected_sku, filter_key, split_date, rmse, mape, bias, mad,
+                                            best_model_name=best_model_name)
+    )
+    log_timing("Forecasts stored", start_time, time.time())
+
+# Format forecasts based on quantity or sales, keeping the raw forecasts for export
+raw_forecasts = forecasts
 if quantity_or_sales == "QUANTITY":
     forecasts = {k: v.round() for k, v in forecasts.items()}
 else:
     forecasts = {k: v.round(2) for k, v in forecasts.items()}
 
-# Identify best model based on MAPE
-best_model_name = min(mape, key=mape.get)
 best_model_forecast = forecasts[best_model_name]
 
 # Model selection
@@ -122,6 +140,22 @@ st.subheader(f"Forecasting Results Table for product {selected_sku}")
 results_sales_df = get_result_table(test, forecasts, selected_model_name)
 st.dataframe(results_sales_df)
 
+# Export results for downstream planning
+if export_control():
+    start_time = time.time()
+    forecast_records = build_forecast_records(selected_sku, filter_key, split_date, test, raw_forecasts)
+    metric_records = build_metric_records(selected_sku, filter_key, split_date, rmse, mape, bias, mad,
+                                          best_model_name=best_model_name)
+    demand_type_records = build_demand_type_records(filter_key, demand_type_info)
+    if use_store:
+        # The run was already loaded from or written to the store above
+        save_to_store(EXPORT_DB_PATH, demand_type_records=demand_type_records)
+    else:
+        save_to_store(EXPORT_DB_PATH, forecast_records, metric_records, demand_type_records)
+    written = export_to_parquet(EXPORT_DIR, forecast_records, metric_records, demand_type_records)
+    log_timing("Results exported", start_time, time.time())
+    st.sidebar.success(f"Exported results to {', '.join(written)}")
+
 # Function for better terminal visibility
 def print_separation_line():
     print("=" * 80)
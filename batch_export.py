@@ -0,0 +1,73 @@
+import argparse
+import time
+import pandas as pd
+from utils.utils_data import *
+from utils.utils_models import MODEL_OPTIONS
+from utils.utils_export import *
+from utils.utils_logging import log_timing
+
+DATA_PATH = "masked_sales_df.csv"
+EXPORT_DIR = "exports"
+EXPORT_DB_PATH = f"{EXPORT_DIR}/forecast_store.db"
+
+def batch_export(sales_df, location_codes, shipment_methods, quantity_or_sales, split_date, data_version,
+                 db_path=EXPORT_DB_PATH, export_dir=EXPORT_DIR):
+    """
+    Forecast every SKU under one set of filters and write all results to the store and Parquet in bulk.
+    Args:
+        sales_df (pd.DataFrame): DataFrame containing sales data.
+        location_codes (list): Location codes to filter by.
+        shipment_methods (list): Shipment methods to filter by.
+        quantity_or_sales (str): Column name to forecast ('QUANTITY' or 'TOTAL_SALES').
+        split_date (datetime): Train/test split date.
+        data_version (str): Version from build_data_version.
+        db_path (str): Path to the SQLite database file.
+        export_dir (str): Directory to write the Parquet datasets to.
+    Returns:
+        int: Number of SKUs that were forecast and exported.
+    """
+    sales_df = filter_location(sales_df, location_codes)
+    sales_df = filter_shipment_method(sales_df, shipment_methods)
+    filter_key = build_filter_key(location_codes, shipment_methods, quantity_or_sales, data_version=data_version)
+    demand_type_info = determine_demand_type(sales_df, quantity_or_sales=quantity_or_sales)
+
+    forecast_frames = []
+    metric_frames = []
+    for sku in sales_df['PRODUCT'].unique():
+        product_weekly = aggregate_weekly_sales(sku, sales_df, quantity_or_sales=quantity_or_sales)
+        train, test = train_test_split(product_weekly, split_date=split_date)
+        # Same threshold as the dashboard
+        if (train != 0).sum() < 13 or test.empty:
+            print(f"Skipped {sku}: not enough sales records before the split date.")
+            continue
+        try:
+            forecasts, rmse, mape, bias, mad = calculate_forecasts(train, test, MODEL_OPTIONS)
+        except Exception as e:
+            print(f"Skipped {sku}: forecasting failed ({e}).")
+            continue
+        best_model_name = min(mape, key=mape.get)
+        forecast_frames.append(build_forecast_records(sku, filter_key, split_date, test, forecasts))
+        metric_frames.append(build_metric_records(sku, filter_key, split_date, rmse, mape, bias, mad,
+                                                  best_model_name=best_model_name))
+
+    forecast_records = pd.concat(forecast_frames, ignore_index=True) if forecast_frames else None
+    metric_records = pd.concat(metric_frames, ignore_index=True) if metric_frames else None
+    demand_type_records = build_demand_type_records(filter_key, demand_type_info)
+    save_to_store(db_path, forecast_records, metric_records, demand_type_records)
+    export_to_parquet(export_dir, forecast_records, metric_records, demand_type_records)
+    return len(forecast_frames)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Forecast all SKUs and export the results to the local store and Parquet.")
+    parser.add_argument("--split-date", required=True, help="Train/test split date (YYYY-MM-DD).")
+    parser.add_argument("--locations", nargs="+", default=["2", "9", "15"], help="Location codes to include.")
+    parser.add_argument("--shipments", nargs="+", default=["WILL CALL", "UPS GROUND"], help="Shipment methods to include.")
+    parser.add_argument("--value", choices=["QUANTITY", "TOTAL_SALES"], default="QUANTITY", help="Value to forecast.")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    sales_df = load_sales_data(DATA_PATH)
+    data_version = build_data_version(DATA_PATH, MODEL_OPTIONS.values())
+    sku_count = batch_export(sales_df, args.locations, args.shipments, args.value,
+                             pd.Timestamp(args.split_date), data_version)
+    log_timing(f"Exported forecasts for {sku_count} SKUs", start_time, time.time())
@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+from utils.utils_data import determine_demand_type, filter_location
+from utils.utils_export import *
+
+MODELS = ['Model A', 'Model B']
+FILTER_KEY = build_filter_key(['9', '2'], ['WILL CALL'], 'QUANTITY')
+
+def make_run(mape_values=(10.0, 20.0)):
+    index = pd.date_range('2025-01-06', periods=4, freq='W-MON')
+    test = pd.Series([1.0, 0.0, 3.0, 4.0], index=index)
+    forecasts = {
+        'Model A': pd.Series([1.0, 2.0, 3.0, 4.0], index=index),
+        'Model B': pd.Series([0.0, 1.0, 2.0, 3.0], index=index)
+    }
+    rmse = {'Model A': 1.0, 'Model B': 2.0}
+    mape = dict(zip(MODELS, mape_values))
+    bias = {'Model A': 0.5, 'Model B': -0.5}
+    mad = {'Model A': 1.5, 'Model B': 2.5}
+    return index, test, forecasts, rmse, mape, bias, mad
+
+def save_run(db_path, split_date, test, forecasts, rmse, mape, bias, mad):
+    save_to_store(
+        db_path,
+        forecast_records=build_forecast_records('PRODUCT_1', FILTER_KEY, split_date, test, forecasts),
+        metric_records=build_metric_records('PRODUCT_1', FILTER_KEY, split_date, rmse, mape, bias, mad,
+                                            best_model_name='Model A')
+    )
+
+def test_load_forecast_run_with_nan_metrics(tmp_path):
+    db_path = str(tmp_path / "store.db")
+    index, test, forecasts, rmse, mape, bias, mad = make_run(mape_values=(np.nan, np.nan))
+    save_run(db_path, index[0], test, forecasts, rmse, mape, bias, mad)
+
+    metric_df = read_metrics(db_path, sku='PRODUCT_1')
+    assert metric_df['MAPE'].dtype == float
+    assert metric_df['MAPE'].isna().all()
+
+    _, _, loaded_mape, _, _ = load_forecast_run(db_path, 'PRODUCT_1', FILTER_KEY, index[0], MODELS, index)
+    assert all(np.isnan(loaded_mape[m]) for m in MODELS)
+
+def test_save_read_load_round_trip(tmp_path):
+    db_path = str(tmp_path / "store.db")
+    index, test, forecasts, rmse, mape, bias, mad = make_run()
+    save_run(db_path, index[0], test, forecasts, rmse, mape, bias, mad)
+
+    forecast_df = read_forecasts(db_path, sku='PRODUCT_1', filter_key=FILTER_KEY, split_date=index[0])
+    assert len(forecast_df) == len(MODELS) * len(index)
+    metric_df = read_metrics(db_path, sku='PRODUCT_1', model='Model A')
+    assert metric_df['IS_BEST'].tolist() == [1]
+
+    loaded = load_forecast_run(db_path, 'PRODUCT_1', FILTER_KEY, index[0].to_pydatetime(), MODELS[::-1], index)
+    loaded_forecasts, loaded_rmse, loaded_mape, loaded_bias, loaded_mad = loaded
+    assert list(loaded_forecasts) == MODELS[::-1]
+    for model_name in MODELS:
+        pd.testing.assert_series_equal(loaded_forecasts[model_name], forecasts[model_name])
+    assert loaded_rmse == rmse
+    assert loaded_mape == mape
+    assert loaded_bias == bias
+    assert loaded_mad == mad
+
+def test_save_updates_existing_key(tmp_path, monkeypatch):
+    monkeypatch.setattr('utils.utils_export.BATCH_SIZE', 3)
+    db_path = str(tmp_path / "store.db")
+    index, test, forecasts, rmse, mape, bias, mad = make_run()
+    save_run(db_path, index[0], test, forecasts, rmse, mape, bias, mad)
+
+    forecasts = {k: v + 10 for k, v in forecasts.items()}
+    rmse = {k: v + 10 for k, v in rmse.items()}
+    save_run(db_path, index[0], test, forecasts, rmse, mape, bias, mad)
+
+    forecast_df = read_forecasts(db_path, sku='PRODUCT_1', model='Model A')
+    assert len(forecast_df) == len(index)
+    assert forecast_df['FORECAST'].tolist() == [11.0, 12.0, 13.0, 14.0]
+    metric_df = read_metrics(db_path)
+    assert metric_df['RMSE'].tolist() == [11.0, 12.0]
+
+def test_demand_types_upsert(tmp_path):
+    db_path = str(tmp_path / "store.db")
+    save_to_store(db_path, demand_type_records=build_demand_type_records(FILTER_KEY, {'PRODUCT_1': 'smooth'}))
+    save_to_store(db_path, demand_type_records=build_demand_type_records(
+        FILTER_KEY, {'PRODUCT_1': 'lumpy', 'PRODUCT_2': 'NA'}))
+
+    demand_type_df = read_demand_types(db_path, filter_key=FILTER_KEY)
+    assert demand_type_df[['SKU', 'DEMAND_TYPE']].values.tolist() == [['PRODUCT_1', 'lumpy'], ['PRODUCT_2', 'NA']]
+
+def test_load_forecast_run_mismatches_return_none(tmp_path):
+    db_path = str(tmp_path / "store.db")
+    index, test, forecasts, rmse, mape, bias, mad = make_run()
+    assert load_forecast_run(db_path, 'PRODUCT_1', FILTER_KEY, index[0], MODELS, index) is None
+
+    save_run(db_path, index[0], test, forecasts, rmse, mape, bias, mad)
+    assert load_forecast_run(db_path, 'PRODUCT_1', FILTER_KEY, index[1], MODELS, index) is None
+    assert load_forecast_run(db_path, 'PRODUCT_2', FILTER_KEY, index[0], MODELS, index) is None
+    assert load_forecast_run(db_path, 'PRODUCT_1', FILTER_KEY + '|DATA=new', index[0], MODELS, index) is None
+    assert load_forecast_run(db_path, 'PRODUCT_1', FILTER_KEY, index[0], MODELS + ['Model C'], index) is None
+
+    longer_index = pd.date_range(index[0], periods=len(index) + 1, freq='W-MON')
+    assert load_forecast_run(db_path, 'PRODUCT_1', FILTER_KEY, index[0], MODELS, longer_index) is None
+
+def test_build_filter_key():
+    assert build_filter_key(['9', '2'], ['WILL CALL', 'UPS GROUND'], 'QUANTITY') == \
+        build_filter_key(['2', '9'], ['UPS GROUND', 'WILL CALL'], 'QUANTITY')
+    assert build_filter_key(['2'], ['WILL CALL'], 'QUANTITY', data_version='abc').endswith('|DATA=abc')
+
+def test_build_data_version_changes_with_data(tmp_path):
+    data_path = tmp_path / "sales.csv"
+    data_path.write_text("ORDER_DATE,QUANTITY\n")
+    version = build_data_version(str(data_path), [make_run])
+    assert version == build_data_version(str(data_path), [make_run])
+
+    data_path.write_text("ORDER_DATE,QUANTITY\n2025-01-06,1\n")
+    assert version != build_data_version(str(data_path), [make_run])
+    assert version != build_data_version(str(data_path), [make_run, save_run])
+
+def test_export_to_parquet_partitions_and_merges(tmp_path):
+    export_dir = str(tmp_path / "exports")
+    index, test, forecasts, rmse, mape, bias, mad = make_run()
+    for split_date in index[:2]:
+        written = export_to_parquet(
+            export_dir,
+            forecast_records=build_forecast_records('PRODUCT_1', FILTER_KEY, split_date, test, forecasts),
+            metric_records=build_metric_records('PRODUCT_1', FILTER_KEY, split_date, rmse, mape, bias, mad)
+        )
+        assert len(written) == 2
+
+    forecasts = {k: v + 10 for k, v in forecasts.items()}
+    written = export_to_parquet(
+        export_dir,
+        forecast_records=build_forecast_records('PRODUCT_1', FILTER_KEY, index[0], test, forecasts),
+        demand_type_records=build_demand_type_records(FILTER_KEY, {'PRODUCT_1': 'smooth'})
+    )
+    assert len(written) == 2
+
+    forecast_df = pd.read_parquet(str(tmp_path / "exports" / "forecasts"))
+    assert len(forecast_df) == 2 * len(MODELS) * len(index)
+    assert not forecast_df.duplicated(subset=FORECAST_KEY).any()
+    first_split = forecast_df[forecast_df['SPLIT_DATE'] == format_split_date(index[0])]
+    assert first_split['FORECAST'].min() >= 10
+    assert len(pd.read_parquet(str(tmp_path / "exports" / "metrics"))) == 2 * len(MODELS)
+    assert len(pd.read_parquet(str(tmp_path / "exports" / "demand_types"))) == 1
+
+def test_demand_types_follow_filters(tmp_path):
+    db_path = str(tmp_path / "store.db")
+    dates = pd.date_range('2024-01-01', periods=30, freq='D')
+    sales_df = pd.concat([
+        # Steady demand at location 2, irregular demand at location 9
+        pd.DataFrame({'ORDER_DATE': dates, 'PRODUCT': 'PRODUCT_1', 'SHIPPING_PLANT': 2.0, 'QUANTITY': 5.0}),
+        pd.DataFrame({'ORDER_DATE': dates, 'PRODUCT': 'PRODUCT_1', 'SHIPPING_PLANT': 9.0,
+                      'QUANTITY': [0.0 if i % 2 else float(1 + 20 * (i % 3)) for i in range(30)]})
+    ], ignore_index=True)
+
+    for location_code in ['2', '9']:
+        location_df = filter_location(sales_df, [location_code])
+        filter_key = build_filter_key([location_code], ['WILL CALL'], 'QUANTITY')
+        demand_type_info = determine_demand_type(location_df, quantity_or_sales='QUANTITY')
+        save_to_store(db_path, demand_type_records=build_demand_type_records(filter_key, demand_type_info))
+
+    demand_type_df = read_demand_types(db_path, sku='PRODUCT_1').set_index('FILTER_KEY')['DEMAND_TYPE']
+    assert demand_type_df[build_filter_key(['2'], ['WILL CALL'], 'QUANTITY')] == 'smooth'
+    assert demand_type_df[build_filter_key(['9'], ['WILL CALL'], 'QUANTITY')] == 'lumpy'
+
+def test_load_forecast_run_requires_metrics(tmp_path):
+    db_path = str(tmp_path / "store.db")
+    index, test, forecasts, rmse, mape, bias, mad = make_run()
+    save_to_store(db_path, forecast_records=build_forecast_records('PRODUCT_1', FILTER_KEY, index[0], test, forecasts))
+    assert load_forecast_run(db_path, 'PRODUCT_1', FILTER_KEY, index[0], MODELS, index) is None
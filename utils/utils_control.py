@@ -42,4 +42,15 @@ def model_control(model_display_names, best_model_name):
                                       model_display_names, 
                                       index=model_display_names.index(best_model_name + " (Best Model)"), 
                                       key="model_selection")
-    return selected_model
\ No newline at end of file
+    return selected_model
+
+def store_control():
+    use_store = st.sidebar.checkbox("Reuse Stored Forecasts", 
+                                    value=False, 
+                                    key="store_reuse_choice")
+    return use_store
+
+def export_control():
+    export_clicked = st.sidebar.button("Export Results to Parquet", 
+                                       key="export_button")
+    return export_clicked
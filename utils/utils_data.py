@@ -71,7 +71,7 @@ def calculate_adi_cv2(df, group_by_cols, quantity_or_sales='QUANTITY'):
     })
 
 @st.cache_data
-def determine_demand_type(_df, quantity_or_sales="QUANTITY"):
+def determine_demand_type(df, quantity_or_sales="QUANTITY"):
     """
     Determine the demand type for each product based on ADI and CV2.
     Args:
@@ -80,7 +80,7 @@ def determine_demand_type(_df, quantity_or_sales="QUANTITY"):
     Returns:
         dict: Dictionary mapping each product to its demand type.
     """
-    adi_cv2_df = calculate_adi_cv2(_df, ['PRODUCT'], quantity_or_sales=quantity_or_sales)
+    adi_cv2_df = calculate_adi_cv2(df, ['PRODUCT'], quantity_or_sales=quantity_or_sales)
     
     conditions = [
         (adi_cv2_df['NonZeroCount'] < 13),  # less than 10 non-zero sales entries → NA
@@ -0,0 +1,382 @@
+import os
+import hashlib
+import inspect
+import sqlite3
+from contextlib import closing
+import pandas as pd
+
+BATCH_SIZE = 5000
+
+FORECAST_KEY = ['SKU', 'FILTER_KEY', 'SPLIT_DATE', 'MODEL', 'FORECAST_DATE']
+METRIC_KEY = ['SKU', 'FILTER_KEY', 'SPLIT_DATE', 'MODEL']
+DEMAND_TYPE_KEY = ['SKU', 'FILTER_KEY']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS forecasts (
+    SKU TEXT NOT NULL,
+    FILTER_KEY TEXT NOT NULL,
+    SPLIT_DATE TEXT NOT NULL,
+    MODEL TEXT NOT NULL,
+    FORECAST_DATE TEXT NOT NULL,
+    ACTUAL REAL,
+    FORECAST REAL,
+    PRIMARY KEY (SKU, FILTER_KEY, SPLIT_DATE, MODEL, FORECAST_DATE)
+);
+CREATE INDEX IF NOT EXISTS idx_forecasts_split_date ON forecasts (SPLIT_DATE, FILTER_KEY);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    SKU TEXT NOT NULL,
+    FILTER_KEY TEXT NOT NULL,
+    SPLIT_DATE TEXT NOT NULL,
+    MODEL TEXT NOT NULL,
+    RMSE REAL,
+    MAPE REAL,
+    BIAS REAL,
+    MAD REAL,
+    IS_BEST INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (SKU, FILTER_KEY, SPLIT_DATE, MODEL)
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_split_date ON metrics (SPLIT_DATE, FILTER_KEY);
+
+CREATE TABLE IF NOT EXISTS demand_types (
+    SKU TEXT NOT NULL,
+    FILTER_KEY TEXT NOT NULL,
+    DEMAND_TYPE TEXT,
+    PRIMARY KEY (SKU, FILTER_KEY)
+);
+"""
+
+def build_data_version(data_path, model_funcs):
+    """
+    Build a short hash of the sales data file and the forecasting model code.
+    Args:
+        data_path (str): Path to the CSV file containing sales data.
+        model_funcs (iterable): Forecasting functions used to produce the results.
+    Returns:
+        str: Version string that changes when the data file or any model function changes.
+    """
+    stat = os.stat(data_path)
+    digest = hashlib.sha1(f"{os.path.abspath(data_path)}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+    for model_func in model_funcs:
+        digest.update(inspect.getsource(model_func).encode())
+    return digest.hexdigest()[:12]
+
+def build_filter_key(location_codes, shipment_methods, quantity_or_sales, data_version=None):
+    """
+    Build a canonical string identifying the dashboard filters a result was computed under.
+    Args:
+        location_codes (list): Selected location codes.
+        shipment_methods (list): Selected shipment methods.
+        quantity_or_sales (str): Value column used ('QUANTITY' or 'TOTAL_SALES').
+        data_version (str, optional): Version from build_data_version, so that stored
+            results are not reused after the data or model code changes.
+    Returns:
+        str: Filter key that is independent of the selection order.
+    """
+    locations = ",".join(sorted(str(code) for code in location_codes))
+    shipments = ",".join(sorted(shipment_methods))
+    filter_key = f"LOC={locations}|SHIP={shipments}|VALUE={quantity_or_sales}"
+    if data_version is not None:
+        filter_key += f"|DATA={data_version}"
+    return filter_key
+
+def format_split_date(split_date):
+    """
+    Format a split date as an ISO date string for storage.
+    Args:
+        split_date (str or datetime): Train/test split date.
+    Returns:
+        str: Split date formatted as YYYY-MM-DD.
+    """
+    return pd.Timestamp(split_date).strftime('%Y-%m-%d')
+
+def build_forecast_records(sku, filter_key, split_date, test, forecasts):
+    """
+    Flatten the forecasts of every model into one row per model and forecast date.
+    Args:
+        sku (str): SKU the forecasts belong to.
+        filter_key (str): Filter key from build_filter_key.
+        split_date (str or datetime): Train/test split date.
+        test (pd.Series): Actual test data.
+        forecasts (dict): Dictionary of forecasts from different models.
+    Returns:
+        pd.DataFrame: DataFrame with one row per (model, forecast date).
+    """
+    frames = []
+    for model_name, forecast in forecasts.items():
+        frames.append(pd.DataFrame({
+            'SKU': sku,
+            'FILTER_KEY': filter_key,
+            'SPLIT_DATE': format_split_date(split_date),
+            'MODEL': model_name,
+            'FORECAST_DATE': test.index.strftime('%Y-%m-%d'),
+            'ACTUAL': pd.to_numeric(test, errors='coerce').values.astype(float),
+            'FORECAST': pd.to_numeric(forecast, errors='coerce').values.astype(float)
+        }))
+    if not frames:
+        return pd.DataFrame(columns=FORECAST_KEY + ['ACTUAL', 'FORECAST'])
+    return pd.concat(frames, ignore_index=True)
+
+def build_metric_records(sku, filter_key, split_date, rmse, mape, bias, mad, best_model_name=None):
+    """
+    Collect the accuracy metrics of every model into one row per model.
+    Args:
+        sku (str): SKU the metrics belong to.
+        filter_key (str): Filter key from build_filter_key.
+        split_date (str or datetime): Train/test split date.
+        rmse, mape, bias, mad (dict): Metric values keyed by model name.
+        best_model_name (str, optional): Name of the best model to flag.
+    Returns:
+        pd.DataFrame: DataFrame with one row per model.
+    """
+    models = list(rmse.keys())
+    return pd.DataFrame({
+        'SKU': sku,
+        'FILTER_KEY': filter_key,
+        'SPLIT_DATE': format_split_date(split_date),
+        'MODEL': models,
+        'RMSE': [float(rmse[m]) for m in models],
+        'MAPE': [float(mape[m]) for m in models],
+        'BIAS': [float(bias[m]) for m in models],
+        'MAD': [float(mad[m]) for m in models],
+        'IS_BEST': [int(m == best_model_name) for m in models]
+    }, columns=METRIC_KEY + ['RMSE', 'MAPE', 'BIAS', 'MAD', 'IS_BEST'])
+
+def build_demand_type_records(filter_key, demand_type_info):
+    """
+    Convert the demand type mapping into one row per SKU.
+    Args:
+        filter_key (str): Filter key from build_filter_key.
+        demand_type_info (dict): Dictionary mapping each product to its demand type.
+    Returns:
+        pd.DataFrame: DataFrame with one row per SKU.
+    """
+    return pd.DataFrame({
+        'SKU': list(demand_type_info.keys()),
+        'FILTER_KEY': filter_key,
+        'DEMAND_TYPE': list(demand_type_info.values())
+    }, columns=DEMAND_TYPE_KEY + ['DEMAND_TYPE'])
+
+def _connect(db_path):
+    """
+    Open a connection to the SQLite store, creating the file and schema if needed.
+    """
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def _upsert(conn, table, df, key_cols):
+    """
+    Insert the rows of a DataFrame in batches, updating rows whose key already exists.
+    """
+    columns = list(df.columns)
+    update_cols = [c for c in columns if c not in key_cols]
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT ({', '.join(key_cols)}) DO "
+        + (f"UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in update_cols)}" if update_cols else "NOTHING")
+    )
+    # NaN values are stored as NULL by SQLite
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany(sql, batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+
+def save_to_store(db_path, forecast_records=None, metric_records=None, demand_type_records=None):
+    """
+    Write forecast, metric, and demand type records to the SQLite store in a single transaction.
+    Args:
+        db_path (str): Path to the SQLite database file.
+        forecast_records (pd.DataFrame, optional): Output of build_forecast_records.
+        metric_records (pd.DataFrame, optional): Output of build_metric_records.
+        demand_type_records (pd.DataFrame, optional): Output of build_demand_type_records.
+    """
+    with closing(_connect(db_path)) as conn, conn:
+        if forecast_records is not None:
+            _upsert(conn, 'forecasts', forecast_records, FORECAST_KEY)
+        if metric_records is not None:
+            _upsert(conn, 'metrics', metric_records, METRIC_KEY)
+        if demand_type_records is not None:
+            _upsert(conn, 'demand_types', demand_type_records, DEMAND_TYPE_KEY)
+
+def _read_query(db_path, sql, params, float_cols=()):
+    """
+    Run a read query against an existing store on a single connection, without touching the schema.
+    Columns in float_cols are cast back to float so that stored NULLs come back as NaN.
+    """
+    if not os.path.exists(db_path):
+        return None
+    with closing(sqlite3.connect(db_path)) as conn:
+        df = pd.read_sql_query(sql, conn, params=params)
+    for column in float_cols:
+        df[column] = pd.to_numeric(df[column], errors='coerce').astype(float)
+    return df
+
+def _read_table(db_path, table, order_by, float_cols=(), **filters):
+    """
+    Read rows from a store table, filtering on the given key columns.
+    """
+    conditions = []
+    params = []
+    for column, value in filters.items():
+        if value is not None:
+            conditions.append(f"{column.upper()} = ?")
+            params.append(value)
+    sql = f"SELECT * FROM {table}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {order_by}"
+    return _read_query(db_path, sql, params, float_cols)
+
+def read_forecasts(db_path, sku=None, filter_key=None, split_date=None, model=None):
+    """
+    Read stored forecasts, optionally restricted to a SKU, filter key, split date, and model.
+    Args:
+        db_path (str): Path to the SQLite database file.
+        sku (str, optional): SKU to read.
+        filter_key (str, optional): Filter key from build_filter_key.
+        split_date (str or datetime, optional): Train/test split date.
+        model (str, optional): Model name.
+    Returns:
+        pd.DataFrame or None: Stored forecast rows, or None if the store does not exist.
+    """
+    if split_date is not None:
+        split_date = format_split_date(split_date)
+    return _read_table(db_path, 'forecasts', 'SKU, FILTER_KEY, SPLIT_DATE, MODEL, FORECAST_DATE',
+                       float_cols=['ACTUAL', 'FORECAST'],
+                       sku=sku, filter_key=filter_key, split_date=split_date, model=model)
+
+def read_metrics(db_path, sku=None, filter_key=None, split_date=None, model=None):
+    """
+    Read stored accuracy metrics, optionally restricted to a SKU, filter key, split date, and model.
+    Args:
+        db_path (str): Path to the SQLite database file.
+        sku (str, optional): SKU to read.
+        filter_key (str, optional): Filter key from build_filter_key.
+        split_date (str or datetime, optional): Train/test split date.
+        model (str, optional): Model name.
+    Returns:
+        pd.DataFrame or None: Stored metric rows, or None if the store does not exist.
+    """
+    if split_date is not None:
+        split_date = format_split_date(split_date)
+    return _read_table(db_path, 'metrics', 'SKU, FILTER_KEY, SPLIT_DATE, MODEL',
+                       float_cols=['RMSE', 'MAPE', 'BIAS', 'MAD'],
+                       sku=sku, filter_key=filter_key, split_date=split_date, model=model)
+
+def read_demand_types(db_path, sku=None, filter_key=None):
+    """
+    Read stored demand type labels, optionally restricted to a SKU and filter key.
+    Args:
+        db_path (str): Path to the SQLite database file.
+        sku (str, optional): SKU to read.
+        filter_key (str, optional): Filter key from build_filter_key.
+    Returns:
+        pd.DataFrame or None: Stored demand type rows, or None if the store does not exist.
+    """
+    return _read_table(db_path, 'demand_types', 'SKU, FILTER_KEY', sku=sku, filter_key=filter_key)
+
+def load_forecast_run(db_path, sku, filter_key, split_date, model_names, index):
+    """
+    Rebuild the output of calculate_forecasts from the store, if a complete run was saved.
+    Args:
+        db_path (str): Path to the SQLite database file.
+        sku (str): SKU to read.
+        filter_key (str): Filter key from build_filter_key.
+        split_date (str or datetime): Train/test split date.
+        model_names (list): Model names that must all be present, in display order.
+        index (pd.DatetimeIndex): Index of the test data the forecasts must cover.
+    Returns:
+        tuple or None: Dictionary of forecasts, RMSE, MAPE, Bias, and MAD for each model,
+        or None if the stored run is missing or does not match the requested models and dates.
+    """
+    # One query on the primary keys of both tables; models without metrics drop out of the join
+    sql = (
+        "SELECT f.MODEL, f.FORECAST_DATE, f.FORECAST, m.RMSE, m.MAPE, m.BIAS, m.MAD "
+        "FROM forecasts f JOIN metrics m "
+        "ON m.SKU = f.SKU AND m.FILTER_KEY = f.FILTER_KEY AND m.SPLIT_DATE = f.SPLIT_DATE AND m.MODEL = f.MODEL "
+        "WHERE f.SKU = ? AND f.FILTER_KEY = ? AND f.SPLIT_DATE = ? "
+        "ORDER BY f.MODEL, f.FORECAST_DATE"
+    )
+    run_df = _read_query(db_path, sql, [sku, filter_key, format_split_date(split_date)],
+                         float_cols=['FORECAST', 'RMSE', 'MAPE', 'BIAS', 'MAD'])
+    if run_df is None:
+        return None
+
+    expected_dates = list(index.strftime('%Y-%m-%d'))
+    model_groups = dict(tuple(run_df.groupby('MODEL')))
+
+    forecasts, rmse, mape, bias, mad = {}, {}, {}, {}, {}
+    for model_name in model_names:
+        model_rows = model_groups.get(model_name)
+        if model_rows is None or model_rows['FORECAST_DATE'].tolist() != expected_dates:
+            return None
+        forecasts[model_name] = pd.Series(model_rows['FORECAST'].values, index=index)
+        metric_row = model_rows.iloc[0]
+        rmse[model_name] = float(metric_row['RMSE'])
+        mape[model_name] = float(metric_row['MAPE'])
+        bias[model_name] = float(metric_row['BIAS'])
+        mad[model_name] = float(metric_row['MAD'])
+    return forecasts, rmse, mape, bias, mad
+
+def _partition_path(export_dir, table, partition_values):
+    """
+    Build the Parquet file path of one partition, e.g. forecasts/<filter hash>/<split date>.parquet.
+    The filter key is hashed because it contains characters that are not safe in file names.
+    """
+    filter_key, *rest = partition_values
+    filter_dir = hashlib.sha1(filter_key.encode()).hexdigest()[:12]
+    if not rest:
+        return os.path.join(export_dir, table, f"{filter_dir}.parquet")
+    return os.path.join(export_dir, table, filter_dir, *[f"{value}.parquet" for value in rest])
+
+def _write_parquet(df, export_dir, table, key_cols, partition_cols):
+    """
+    Write a DataFrame as one Parquet file per partition, merging only into the partitions it touches
+    and keeping the newest row for each key.
+    """
+    written = []
+    for partition_values, part in df.groupby(partition_cols, sort=False):
+        if not isinstance(partition_values, tuple):
+            partition_values = (partition_values,)
+        path = _partition_path(export_dir, table, partition_values)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            part = pd.concat([pd.read_parquet(path), part], ignore_index=True)
+        part = part.drop_duplicates(subset=key_cols, keep='last').sort_values(key_cols)
+        part.to_parquet(path, index=False)
+        written.append(path)
+    return written
+
+def export_to_parquet(export_dir, forecast_records=None, metric_records=None, demand_type_records=None):
+    """
+    Write forecast, metric, and demand type records to partitioned Parquet files in the export directory.
+    Forecasts and metrics are partitioned by filter key and split date, and demand types by filter key,
+    so each directory (e.g. exports/forecasts) can be read back as a single dataset with pd.read_parquet.
+    Args:
+        export_dir (str): Directory to write the forecasts, metrics, and demand_types datasets to.
+        forecast_records (pd.DataFrame, optional): Output of build_forecast_records.
+        metric_records (pd.DataFrame, optional): Output of build_metric_records.
+        demand_type_records (pd.DataFrame, optional): Output of build_demand_type_records.
+    Returns:
+        list: Paths of the files that were written.
+    """
+    written = []
+    for name, df, key_cols, partition_cols in [
+        ('forecasts', forecast_records, FORECAST_KEY, ['FILTER_KEY', 'SPLIT_DATE']),
+        ('metrics', metric_records, METRIC_KEY, ['FILTER_KEY', 'SPLIT_DATE']),
+        ('demand_types', demand_type_records, DEMAND_TYPE_KEY, ['FILTER_KEY'])
+    ]:
+        if df is None:
+            continue
+        written.extend(_write_parquet(df, export_dir, name, key_cols, partition_cols))
+    return written
@@ -0,0 +1,10 @@
+def log_timing(description, start_time, end_time):
+    """
+    Print the time elapsed between two timestamps to the terminal.
+    Args:
+        description (str): Description of the step that was timed.
+        start_time (float): Start time from time.time().
+        end_time (float): End time from time.time().
+    """
+    elapsed_time = end_time - start_time
+    print(f"{description} in {elapsed_time:.2f} seconds.")
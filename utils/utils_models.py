@@ -78,4 +78,12 @@ def forecast_gradient_boost(train: pd.Series, test: pd.Series, lags: int = 52, n
         current_history.pop(0)
         current_history.append(next_prediction)
 
-    return np.array(predictions), model.get_params()
\ No newline at end of file
+    return np.array(predictions), model.get_params()
+
+MODEL_OPTIONS = {
+    "Auto ARIMA": forecast_auto_arima,
+    "Seasonal ARIMA": forecast_sarima,
+    "Holt-Winters": forecast_holt_winters,
+    "Bayesian Regression": forecast_bayesian,
+    "Gradient Boosting": forecast_gradient_boost
+}
\ No newline at end of file